@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Database Backends for the Online Bookstore Data Import and Benchmarks
+This module lets the importer and the benchmarks target the remote MySQL server,
+a local MySQL container, or an embedded DuckDB database on the same machine.
+It also loads schema_design.sql and the analysis queries, translating the MySQL
+dialect for DuckDB where needed.
+
+DuckDB has no triggers, stored procedures, events or MySQL-style indexes, so those
+parts of the SQL scripts are skipped there. The update_stock_after_order trigger is
+emulated by DuckDBCursor instead, so both engines hold the same data after an import.
+"""
+
+import os
+import re
+import threading
+
+import mysql.connector
+from config import BACKEND, DB_CONFIG, LOCAL_MYSQL_CONFIG, DUCKDB_SETTINGS
+
+SQL_DIR = os.path.join(os.path.dirname(__file__), '..')
+SCHEMA_PATH = os.path.join(SQL_DIR, 'schema_design.sql')
+
+BACKENDS = ['mysql', 'mysql-local', 'duckdb']
+
+# Backends of the MySQL-only tools (verification, reconciliation, streaming export), which
+# rely on MySQL functions and unbuffered cursors. They follow BACKEND when it is a MySQL
+# server and fall back to the local container when BACKEND is duckdb.
+MYSQL_BACKENDS = ['mysql', 'mysql-local']
+DEFAULT_MYSQL_BACKEND = BACKEND if BACKEND in MYSQL_BACKENDS else 'mysql-local'
+
+def database_errors():
+    """Exception types a backend may raise for database errors"""
+    errors = [mysql.connector.Error]
+    try:
+        import duckdb
+        errors.append(duckdb.Error)
+    except ImportError:
+        pass
+    return tuple(errors)
+
+def mysql_config(backend):
+    """Connection settings of a MySQL backend"""
+    return dict(LOCAL_MYSQL_CONFIG if backend == 'mysql-local' else DB_CONFIG)
+
+def duckdb_path():
+    """DuckDB database file, relative paths resolved against this directory"""
+    path = DUCKDB_SETTINGS['database']
+    if path == ':memory:' or os.path.isabs(path):
+        return path
+    return os.path.join(os.path.dirname(__file__), path)
+
+def connect(backend, with_database=True):
+    """Open a connection to the given backend
+
+    with_database=False connects to a MySQL server without selecting the bookstore
+    database, which is needed before schema_design.sql has created it.
+    """
+    if backend in ('mysql', 'mysql-local'):
+        config = mysql_config(backend)
+        if not with_database:
+            config.pop('database', None)
+        return mysql.connector.connect(**config)
+
+    if backend == 'duckdb':
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("duckdb is required for the duckdb backend. "
+                              "Please install requirements with: pip install -r requirements.txt")
+        return DuckDBConnection(duckdb.connect(duckdb_path()))
+
+    raise ValueError(f"Unknown backend '{backend}'. Choose one of: {', '.join(BACKENDS)}")
+
+def reset_database(backend, allow_remote=False):
+    """Drop the bookstore database so the schema can be created from scratch
+
+    The 'mysql' backend is the shared remote server, so it is only dropped when the
+    caller passes allow_remote=True (the scripts' --reset-remote flag).
+    """
+    if backend == 'mysql' and not allow_remote:
+        raise ValueError(f"Refusing to drop database '{DB_CONFIG['database']}' on the remote server "
+                         f"{DB_CONFIG['host']}; pass --reset-remote to really do this")
+
+    if backend == 'duckdb':
+        path = duckdb_path()
+        for file_path in (path, path + '.wal'):
+            if path != ':memory:' and os.path.exists(file_path):
+                os.remove(file_path)
+        return
+
+    connection = connect(backend, with_database=False)
+    try:
+        cursor = connection.cursor()
+        cursor.execute(f"DROP DATABASE IF EXISTS {mysql_config(backend)['database']}")
+        cursor.close()
+    finally:
+        connection.close()
+
+ORDER_ITEMS_INSERT = re.compile(r'\s*INSERT INTO order_items\s*\(([^)]*)\)', re.IGNORECASE)
+
+# Body of schema_design.sql's update_stock_after_order trigger
+STOCK_TRIGGER_STATEMENTS = [
+    """
+    UPDATE books
+    SET stock_quantity = stock_quantity - ?,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE book_id = ?
+    """,
+    """
+    INSERT INTO inventory_transactions (book_id, transaction_type, quantity_change, reference_id, reference_type, notes)
+    VALUES (?, 'Sale', ?, ?, 'Order', 'Stock reduced due to sale')
+    """,
+]
+
+class WorkerConnections:
+    """One connection per worker thread of a thread pool, reused across chunks
+
+    Use as a context manager around the pool; every connection is closed on exit.
+    """
+
+    def __init__(self, backend='mysql'):
+        self.backend = backend
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+
+    def get(self):
+        """Connection of the calling thread, opened on first use"""
+        if not hasattr(self.local, 'connection'):
+            self.local.connection = connect(self.backend)
+            with self.lock:
+                self.connections.append(self.local.connection)
+        return self.local.connection
+
+    def close(self):
+        with self.lock:
+            for connection in self.connections:
+                connection.close()
+            self.connections.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class DuckDBCursor:
+    """DB-API cursor wrapper that accepts the importer's %s placeholders
+
+    Inserts into order_items also run the update_stock_after_order trigger body in the
+    same transaction, so a sale that would push stock_quantity below zero fails the
+    CHECK constraint and the order_items row is rolled back, as on MySQL.
+    """
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def execute(self, query, params=None):
+        if params is None:
+            self.cursor.execute(query)
+            return
+
+        values = [to_duckdb_value(value) for value in params]
+        match = ORDER_ITEMS_INSERT.match(query)
+        if not match:
+            self.cursor.execute(query.replace('%s', '?'), values)
+            return
+
+        row = dict(zip([column.strip() for column in match.group(1).split(',')], values))
+        self.cursor.execute("BEGIN TRANSACTION")
+        try:
+            self.cursor.execute(query.replace('%s', '?'), values)
+            update_stock, insert_transaction = STOCK_TRIGGER_STATEMENTS
+            self.cursor.execute(update_stock, [row['quantity'], row['book_id']])
+            self.cursor.execute(insert_transaction, [row['book_id'], -row['quantity'], row['order_id']])
+            self.cursor.execute("COMMIT")
+        except Exception:
+            self.cursor.execute("ROLLBACK")
+            raise
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchmany(self, size):
+        return self.cursor.fetchmany(size)
+
+    @property
+    def column_names(self):
+        return [column[0] for column in self.cursor.description or []]
+
+    def close(self):
+        self.cursor.close()
+
+class DuckDBConnection:
+    """Connection wrapper giving DuckDB the subset of the MySQL connector API the scripts use
+
+    Statements run in autocommit mode: the importer skips rows that fail a constraint and
+    carries on, and a DuckDB transaction cannot continue after an error. commit() and
+    rollback() are therefore no-ops.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def cursor(self, buffered=None):
+        return DuckDBCursor(self.connection.cursor())
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.connection.close()
+
+def to_duckdb_value(value):
+    """Convert numpy scalars coming from pandas rows into plain Python values"""
+    return value.item() if hasattr(value, 'item') and not isinstance(value, (str, bytes)) else value
+
+# =====================================================
+# SQL SCRIPT PARSING
+# =====================================================
+
+def iter_sql_statements(path):
+    """Yield (label, statement) for every statement of a MySQL script
+
+    Honours DELIMITER changes, so trigger and procedure bodies come out whole. The label
+    is the "Query N: ..." heading before the statement if there is one, otherwise the
+    last descriptive comment line.
+    """
+    delimiter = ';'
+    comments = []
+    buffer = []
+
+    with open(path, 'r') as f:
+        for line in f:
+            stripped = line.strip()
+
+            if not buffer:
+                if stripped.upper().startswith('DELIMITER '):
+                    delimiter = stripped.split()[1]
+                    continue
+                if not stripped:
+                    continue
+                if stripped.startswith('--'):
+                    comment = stripped.lstrip('-').strip()
+                    if comment and not comment.startswith('='):
+                        comments.append(comment)
+                    continue
+
+            buffer.append(line)
+            if stripped.endswith(delimiter):
+                statement = ''.join(buffer).strip()
+                yield statement_label(comments), statement[:-len(delimiter)].strip()
+                buffer = []
+                comments = []
+
+    if buffer and ''.join(buffer).strip():
+        yield statement_label(comments), ''.join(buffer).strip()
+
+def statement_label(comments):
+    """Pick a readable label from the comment lines before a statement"""
+    for comment in comments:
+        if re.match(r'(optimized )?query \d+', comment, re.IGNORECASE):
+            return comment
+    return comments[-1] if comments else None
+
+def strip_comments(sql):
+    """Remove -- comments outside string literals"""
+    lines = []
+    for line in sql.splitlines():
+        in_string = False
+        for i, char in enumerate(line):
+            if char == "'":
+                in_string = not in_string
+            elif not in_string and line.startswith('--', i):
+                line = line[:i]
+                break
+        lines.append(line.rstrip())
+    return '\n'.join(line for line in lines if line.strip())
+
+def split_top_level(text, separator=','):
+    """Split on separator outside parentheses and string literals"""
+    parts = []
+    depth = 0
+    in_string = False
+    current = []
+    for char in text:
+        if char == "'":
+            in_string = not in_string
+        elif not in_string and char == '(':
+            depth += 1
+        elif not in_string and char == ')':
+            depth -= 1
+        if char == separator and depth == 0 and not in_string:
+            parts.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    if ''.join(current).strip():
+        parts.append(''.join(current).strip())
+    return parts
+
+def rewrite_calls(sql, name, rewrite):
+    """Replace every NAME(args) call with rewrite(list_of_args), innermost calls included"""
+    pattern = re.compile(r'\b' + name + r'\s*\(', re.IGNORECASE)
+    result = []
+    position = 0
+
+    while True:
+        match = pattern.search(sql, position)
+        if not match:
+            result.append(sql[position:])
+            return ''.join(result)
+
+        depth = 1
+        end = match.end()
+        while depth:
+            if sql[end] == '(':
+                depth += 1
+            elif sql[end] == ')':
+                depth -= 1
+            end += 1
+
+        arguments = split_top_level(sql[match.end():end - 1])
+        arguments = [rewrite_calls(argument, name, rewrite) for argument in arguments]
+        result.append(sql[position:match.start()])
+        result.append(rewrite(arguments))
+        position = end
+
+# =====================================================
+# MYSQL -> DUCKDB TRANSLATION
+# =====================================================
+
+def translate_create_table(statement):
+    """Translate a MySQL CREATE TABLE into DuckDB statements (sequence + table)"""
+    statement = strip_comments(statement)
+    match = re.match(r'CREATE TABLE (?:IF NOT EXISTS )?(\w+)\s*\((.*)\)\s*$', statement, re.DOTALL | re.IGNORECASE)
+    table = match.group(1)
+    statements = []
+    definitions = []
+
+    for item in split_top_level(match.group(2)):
+        keyword = item.split()[0].upper()
+        if keyword in ('INDEX', 'KEY', 'FULLTEXT', 'FOREIGN'):
+            # Secondary indexes and foreign keys are not used by DuckDB's columnar scans
+            continue
+        if keyword == 'UNIQUE' and item.split()[1].upper() == 'KEY':
+            definitions.append('UNIQUE ' + item[item.index('('):])
+            continue
+
+        column = re.sub(r'\bENUM\s*\([^)]*\)', 'VARCHAR', item, flags=re.IGNORECASE)
+        column = re.sub(r'\bYEAR\b', 'INTEGER', column)
+        column = re.sub(r'\s+ON UPDATE CURRENT_TIMESTAMP', '', column, flags=re.IGNORECASE)
+        if re.search(r'\bAUTO_INCREMENT\b', column, re.IGNORECASE):
+            sequence = f"seq_{table}"
+            statements.append(f"CREATE SEQUENCE IF NOT EXISTS {sequence}")
+            column = re.sub(r'\s+AUTO_INCREMENT', f" DEFAULT nextval('{sequence}')", column, flags=re.IGNORECASE)
+        definitions.append(column)
+
+    statements.append(f"CREATE TABLE {table} (\n    " + ',\n    '.join(definitions) + "\n)")
+    return statements
+
+def translate_query(sql):
+    """Translate the MySQL functions used by the analysis queries to DuckDB"""
+    sql = strip_comments(sql)
+    sql = re.sub(r'\bCURDATE\(\)', 'current_date', sql, flags=re.IGNORECASE)
+    sql = rewrite_calls(sql, 'DATE_FORMAT', lambda args: f"strftime({args[0]}, {args[1]})")
+    sql = rewrite_calls(sql, 'DATE_SUB', lambda args: f"({args[0]} - {args[1]})")
+    sql = rewrite_calls(sql, 'DATEDIFF',
+                        lambda args: f"date_diff('day', CAST({args[1]} AS DATE), CAST({args[0]} AS DATE))")
+
+    def group_concat(args):
+        expression, _, separator = args[0].rpartition(' SEPARATOR ')
+        return f"string_agg({expression}, {separator})" if expression else f"string_agg({args[0]}, ',')"
+
+    sql = rewrite_calls(sql, 'GROUP_CONCAT', group_concat)
+    return wrap_grouped_order_by(sql)
+
+def find_top_level(sql, keyword):
+    """Positions of a keyword outside parentheses and string literals"""
+    positions = []
+    depth = 0
+    in_string = False
+    pattern = re.compile(r'\b' + keyword.replace(' ', r'\s+') + r'\b', re.IGNORECASE)
+    for i, char in enumerate(sql):
+        if char == "'":
+            in_string = not in_string
+        elif not in_string and char == '(':
+            depth += 1
+        elif not in_string and char == ')':
+            depth -= 1
+        elif not in_string and depth == 0 and pattern.match(sql, i) and (i == 0 or not sql[i - 1].isalnum()):
+            positions.append(i)
+    return positions
+
+def wrap_grouped_order_by(sql):
+    """Wrap CASE expressions in the ORDER BY of a grouped query in ANY_VALUE()
+
+    MySQL accepts ORDER BY expressions over ungrouped columns (complex queries 8 and 10
+    order their CASE buckets by MONTH(order_date) and total_orders); DuckDB requires them
+    to be grouped or aggregated. The sort expressions only depend on the grouped CASE,
+    so ANY_VALUE() gives the same order.
+    """
+    group_by = find_top_level(sql, 'GROUP BY')
+    order_by = find_top_level(sql, 'ORDER BY')
+    if not group_by or not order_by or order_by[-1] < group_by[-1]:
+        return sql
+
+    start = order_by[-1] + len(re.match(r'ORDER\s+BY', sql[order_by[-1]:], re.IGNORECASE).group(0))
+    limit = find_top_level(sql[start:], 'LIMIT')
+    end = start + limit[0] if limit else len(sql)
+
+    items = []
+    for item in split_top_level(sql[start:end]):
+        if re.match(r'CASE\b', item, re.IGNORECASE):
+            direction = re.search(r'\s+(ASC|DESC)$', item, re.IGNORECASE)
+            if direction:
+                item = f"ANY_VALUE({item[:direction.start()]}){direction.group(0)}"
+            else:
+                item = f"ANY_VALUE({item})"
+        items.append(item)
+    return sql[:start] + ' ' + ', '.join(items) + (' ' + sql[end:] if end < len(sql) else '')
+
+# Statements with no DuckDB equivalent: MySQL session/DDL helpers, full-text search,
+# EXPLAIN FORMAT=JSON and MySQL's information_schema statistics
+DUCKDB_UNSUPPORTED = re.compile(
+    r'^\s*(USE|CREATE DATABASE|CREATE (FULLTEXT |UNIQUE )?INDEX|CREATE TRIGGER|CREATE PROCEDURE|'
+    r'CREATE FUNCTION|CREATE EVENT|SET GLOBAL|EXPLAIN|SHOW|COMMIT)\b'
+    r'|MATCH\s*\(.*\)\s*AGAINST|information_schema\.(STATISTICS|TABLES)',
+    re.IGNORECASE | re.DOTALL,
+)
+
+def translate_statement(statement, backend):
+    """Statements to run for one MySQL statement on the given backend ([] = skip)"""
+    if backend != 'duckdb':
+        return [statement]
+    if DUCKDB_UNSUPPORTED.search(statement):
+        return []
+    if re.match(r'\s*CREATE TABLE', statement, re.IGNORECASE):
+        return translate_create_table(statement)
+    return [translate_query(statement)]
+
+def load_schema(connection, backend, path=SCHEMA_PATH):
+    """Create the bookstore schema from schema_design.sql and return the statement count"""
+    cursor = connection.cursor()
+    executed = 0
+    for _, statement in iter_sql_statements(path):
+        for translated in translate_statement(statement, backend):
+            cursor.execute(translated)
+            executed += 1
+    cursor.close()
+    connection.commit()
+    return executed
+
+def load_queries(path):
+    """Read the SELECT/WITH statements of an analysis script as [(label, sql)]"""
+    return [
+        (label, statement)
+        for label, statement in iter_sql_statements(path)
+        if re.match(r'\s*(SELECT|WITH)\b', strip_comments(statement), re.IGNORECASE)
+    ]
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Backend Benchmark for Online Bookstore Management System
+This script loads schema_design.sql, runs the data import and times the analysis
+queries of performance_optimization.sql and complex_queries.sql on one backend
+(remote MySQL, a local MySQL container or embedded DuckDB), so throughput and
+latency can be measured repeatably on a single machine.
+
+Unless --skip-import is given, the bookstore database is dropped first. That is only
+allowed on the remote 'mysql' backend with --reset-remote.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+import backends
+from config import BACKEND
+from data_import import read_books_csv, import_all_data
+
+# The benchmark drops and reloads the database, so it never defaults to the shared remote server
+DEFAULT_BACKEND = BACKEND if BACKEND != 'mysql' else 'duckdb'
+
+ANALYSIS_SCRIPTS = ['performance_optimization.sql', 'complex_queries.sql']
+
+IMPORTED_TABLES = [
+    'books', 'authors', 'book_authors', 'customers', 'orders', 'order_items',
+    'book_reviews', 'wishlist', 'inventory_transactions', 'discount_codes',
+]
+
+def prepare_database(backend, reset_remote=False):
+    """Recreate the schema and return (connection, seconds)"""
+    start = time.perf_counter()
+    backends.reset_database(backend, allow_remote=reset_remote)
+    # One connection for the whole run, so an in-memory DuckDB database survives
+    connection = backends.connect(backend, with_database=False)
+    backends.load_schema(connection, backend)
+    return connection, time.perf_counter() - start
+
+def run_import(connection):
+    """Run the data import and return (rows imported, seconds)
+
+    This is data_import.py's own throughput: one INSERT per row, autocommitted on DuckDB
+    so rejected rows can be skipped. It is not a bulk-load figure for either engine.
+    """
+    cursor = connection.cursor()
+    start = time.perf_counter()
+    # Only the totals matter here; data_import's per-step progress lines would bury the results
+    with contextlib.redirect_stdout(io.StringIO()):
+        books_df = read_books_csv()
+        import_all_data(cursor, books_df)
+    connection.commit()
+    elapsed = time.perf_counter() - start
+
+    rows = 0
+    for table in IMPORTED_TABLES:
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        rows += cursor.fetchone()[0]
+    cursor.close()
+    return rows, elapsed
+
+def apply_indexes(connection, backend):
+    """Create the performance_optimization.sql indexes (MySQL only) and return how many ran"""
+    cursor = connection.cursor()
+    created = 0
+    path = os.path.join(backends.SQL_DIR, 'performance_optimization.sql')
+    for _, statement in backends.iter_sql_statements(path):
+        if not statement.upper().startswith(('CREATE INDEX', 'CREATE FULLTEXT INDEX')):
+            continue
+        for translated in backends.translate_statement(statement, backend):
+            cursor.execute(translated)
+            created += 1
+    cursor.close()
+    connection.commit()
+    return created
+
+def time_queries(connection, backend, repeat):
+    """Run every analysis query once to warm up, then `repeat` timed runs"""
+    results = []
+    cursor = connection.cursor()
+
+    for script in ANALYSIS_SCRIPTS:
+        for label, statement in backends.load_queries(os.path.join(backends.SQL_DIR, script)):
+            translated = backends.translate_statement(statement, backend)
+            if not translated:
+                results.append((script, label, None, None, 'skipped (no equivalent on this backend)'))
+                continue
+
+            try:
+                cursor.execute(translated[0])
+                rows = len(cursor.fetchall())
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    cursor.execute(translated[0])
+                    cursor.fetchall()
+                    timings.append((time.perf_counter() - start) * 1000)
+                results.append((script, label, rows, timings, None))
+            except backends.database_errors() as err:
+                results.append((script, label, None, None, str(err).splitlines()[0]))
+
+    cursor.close()
+    return results
+
+def print_results(backend, schema_seconds, import_rows, import_seconds, query_results):
+    """Print import throughput and per-query latency"""
+    print("\n" + "="*90)
+    print(f"BACKEND BENCHMARK RESULTS ({backend})")
+    print("="*90)
+
+    if schema_seconds is not None:
+        print(f"{'Schema load':.<30} {schema_seconds:>10.2f} s")
+    if import_rows is not None:
+        rate = import_rows / import_seconds if import_seconds else 0
+        print(f"{'Import (row-by-row inserts)':.<30} {import_seconds:>10.2f} s {import_rows:>10} rows {rate:>10,.0f} rows/s")
+
+    print(f"\n{'query':<58} {'rows':>6} {'min ms':>8} {'median':>8} {'max ms':>8}")
+    for script, label, rows, timings, error in query_results:
+        name = f"{script.split('_')[0]}: {label}"[:58]
+        if error:
+            print(f"{name:<58} {error}")
+            continue
+        print(f"{name:<58} {rows:>6} {min(timings):>8.1f} {statistics.median(timings):>8.1f} {max(timings):>8.1f}")
+
+def main():
+    """Main function to run the backend benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark import and analysis queries on one backend")
+    parser.add_argument('--backend', choices=backends.BACKENDS, default=DEFAULT_BACKEND,
+                        help=f"database backend (default: {DEFAULT_BACKEND})")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per query")
+    parser.add_argument('--skip-import', action='store_true',
+                        help="time the queries against the data already in the database")
+    parser.add_argument('--reset-remote', action='store_true',
+                        help="allow dropping and reloading the bookstore database on the remote 'mysql' backend")
+    args = parser.parse_args()
+
+    print(f"Starting Backend Benchmark ({args.backend})")
+    print("="*50)
+
+    schema_seconds = import_rows = import_seconds = None
+    try:
+        if args.skip_import:
+            connection = backends.connect(args.backend)
+        else:
+            print("Loading schema...")
+            connection, schema_seconds = prepare_database(args.backend, args.reset_remote)
+            print("Importing data...")
+            import_rows, import_seconds = run_import(connection)
+    except (ImportError, ValueError) + backends.database_errors() as err:
+        print(f"Error preparing {args.backend}: {err}")
+        sys.exit(1)
+
+    try:
+        if not args.skip_import:
+            print("Applying indexes...")
+            apply_indexes(connection, args.backend)
+        print(f"Timing analysis queries ({args.repeat} runs each)...")
+        query_results = time_queries(connection, args.backend, args.repeat)
+    finally:
+        connection.close()
+
+    print_results(args.backend, schema_seconds, import_rows, import_seconds, query_results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Export Benchmark for Online Bookstore Management System
+This script compares the importer's fetchall() pattern with the streaming writers of
+export_stream.py on the same query. Every run happens in a fresh process so peak RSS
+is measured per method, and rows per second are reported alongside it.
+"""
+
+import argparse
+import multiprocessing
+import os
+import queue
+import resource
+import sys
+import tempfile
+import time
+
+METHODS = ['fetchall-csv', 'stream-csv', 'stream-parquet']
+
+def peak_rss_mb():
+    """Peak resident set size of the current process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_method(method, query, output_dir, batch_size, backend, results):
+    """Run one export method in this (child) process and report its measurements"""
+    import backends
+    import export_stream
+
+    connection = None
+    try:
+        connection = backends.connect(backend)
+        if method == 'stream-parquet':
+            # pyarrow is imported lazily; load it now so it counts as overhead, not export memory
+            export_stream.require_pyarrow()
+        # Import and connection overhead, so the report can show what the export itself added
+        baseline_rss = peak_rss_mb()
+
+        path = os.path.join(output_dir, f"{method}.{method.split('-')[1]}")
+        start = time.perf_counter()
+        if method == 'fetchall-csv':
+            rows = export_stream.write_csv_fetchall(connection, query, path)
+        elif method == 'stream-csv':
+            rows = export_stream.write_csv(connection, query, path, batch_size=batch_size)
+        else:
+            rows = export_stream.write_parquet(connection, query, path, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        results.put((method, rows, elapsed, baseline_rss, peak_rss_mb(), os.path.getsize(path)))
+    except Exception as e:
+        results.put((method, None, str(e), None, None, None))
+    finally:
+        if connection is not None:
+            connection.close()
+
+def wait_for_result(process, results, method, timeout):
+    """Wait for a run's measurement, recording runs that die or exceed the timeout
+
+    A run that is OOM-killed never puts anything on the queue, so poll it instead of
+    blocking on results.get().
+    """
+    deadline = time.monotonic() + timeout if timeout else None
+    while True:
+        try:
+            return results.get(timeout=1)
+        except queue.Empty:
+            pass
+
+        if not process.is_alive():
+            # The child may have queued its result just before exiting
+            try:
+                return results.get(timeout=1)
+            except queue.Empty:
+                pass
+            process.join()
+            if process.exitcode is not None and process.exitcode < 0:
+                reason = f"killed by signal {-process.exitcode} (SIGKILL usually means out of memory)"
+            else:
+                reason = f"exited with code {process.exitcode} without a result"
+            return (method, None, reason, None, None, None)
+
+        if deadline is not None and time.monotonic() > deadline:
+            process.terminate()
+            process.join()
+            return (method, None, f"timed out after {timeout}s", None, None, None)
+
+def benchmark(query, methods, batch_size, repeat, timeout=None, backend='mysql'):
+    """Run each method `repeat` times in fresh processes and collect the results"""
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    measurements = []
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        for method in methods:
+            for run in range(repeat):
+                print(f"Running {method} ({run + 1}/{repeat})...")
+                process = context.Process(target=run_method,
+                                          args=(method, query, output_dir, batch_size, backend, results))
+                process.start()
+                measurement = wait_for_result(process, results, method, timeout)
+                process.join()
+                measurements.append(measurement)
+
+    return measurements
+
+def print_results(measurements):
+    """Print one line per run"""
+    print("\n" + "="*80)
+    print("EXPORT BENCHMARK RESULTS")
+    print("="*80)
+    print(f"{'method':<16} {'rows':>10} {'seconds':>9} {'rows/s':>12} {'base MB':>9} {'peak MB':>9} {'added MB':>9} {'file MB':>9}")
+
+    for method, rows, elapsed, baseline_rss, peak_rss, file_size in measurements:
+        if rows is None:
+            print(f"{method:<16} ERROR: {elapsed}")
+            continue
+        rate = rows / elapsed if elapsed else 0
+        print(f"{method:<16} {rows:>10} {elapsed:>9.2f} {rate:>12,.0f} "
+              f"{baseline_rss:>9.1f} {peak_rss:>9.1f} {peak_rss - baseline_rss:>9.1f} {file_size / (1024 * 1024):>9.1f}")
+
+def main():
+    """Main function to run the export benchmark"""
+    import backends
+    from config import EXPORT_SETTINGS
+    from export_stream import resolve_query
+
+    parser = argparse.ArgumentParser(description="Compare fetchall() and streaming exports")
+    parser.add_argument('export', nargs='?', default='book_sales_performance',
+                        help="named export from export_stream.py (default: book_sales_performance)")
+    parser.add_argument('--sql', help="benchmark an arbitrary SELECT instead of a named export")
+    parser.add_argument('--methods', nargs='+', choices=METHODS, default=METHODS)
+    parser.add_argument('--batch-size', type=int, default=EXPORT_SETTINGS['batch_size'])
+    parser.add_argument('--repeat', type=int, default=1, help="runs per method")
+    parser.add_argument('--backend', choices=backends.MYSQL_BACKENDS, default=backends.DEFAULT_MYSQL_BACKEND,
+                        help=f"MySQL server to use (default: {backends.DEFAULT_MYSQL_BACKEND})")
+    parser.add_argument('--timeout', type=int, default=3600,
+                        help="seconds before a run is stopped and recorded as timed out")
+    args = parser.parse_args()
+
+    try:
+        query = args.sql or resolve_query(args.export)
+    except KeyError as e:
+        print(e.args[0])
+        sys.exit(1)
+
+    print(f"Starting Export Benchmark ({args.backend})")
+    print("="*50)
+    measurements = benchmark(query, args.methods, args.batch_size, args.repeat, args.timeout, args.backend)
+    print_results(measurements)
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,24 @@ DB_CONFIG = {
     'port': 3306
 }
 
+# Backend used by data_import.py and benchmark_backends.py: 'mysql', 'mysql-local' or 'duckdb'
+BACKEND = 'mysql'
+
+# Local MySQL container, e.g.
+# docker run -d --name bookstore-mysql -e MYSQL_ROOT_PASSWORD=bookstore -p 3306:3306 mysql:8.0.41
+LOCAL_MYSQL_CONFIG = {
+    'host': '127.0.0.1',
+    'user': 'root',
+    'password': 'bookstore',
+    'database': 'bookstore',
+    'port': 3306
+}
+
+# Embedded DuckDB database (':memory:' keeps everything in RAM)
+DUCKDB_SETTINGS = {
+    'database': 'bookstore.duckdb',
+}
+
 # Data generation settings
 DATA_SETTINGS = {
     'total_books': 1000,  # Total number of books to generate
@@ -23,6 +41,25 @@ DATA_SETTINGS = {
     'reviews_count': 50,  # Number of reviews to generate
     'inventory_transactions_count': 200,  # Number of inventory transactions
     'wishlist_items_count': 50,  # Number of wishlist items
+    'random_seed': 568,  # Seed for the data generator (verify_import.py replays it)
+}
+
+# Inventory reconciliation settings
+RECONCILE_SETTINGS = {
+    'chunk_size': 5000,  # Number of book_ids checked per chunk
+    'max_workers': 4,  # Number of chunks reconciled in parallel (one connection each)
+}
+
+# Import verification settings
+VERIFY_SETTINGS = {
+    'chunk_size': 100000,  # Primary-key range covered by one checksum chunk
+    'max_workers': 8,  # Number of chunks checksummed in parallel on the server
+}
+
+# Streaming export settings
+EXPORT_SETTINGS = {
+    'batch_size': 10000,  # Rows fetched from the server per fetchmany() call
+    'row_group_size': 100000,  # Rows per Parquet row group (several fetchmany() batches)
 }
 
 # File paths
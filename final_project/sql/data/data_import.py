@@ -5,21 +5,22 @@ This script imports books.csv data and generates additional fake data for the co
 """
 
 import pandas as pd
-import mysql.connector
+import argparse
 import random
 from datetime import datetime, timedelta
 import sys
 import os
-from config import DB_CONFIG, DATA_SETTINGS, CSV_FILE_PATH
+from config import BACKEND, DATA_SETTINGS, CSV_FILE_PATH
+import backends
 
-def connect_to_database():
-    """Connect to MySQL database"""
+def connect_to_database(backend=BACKEND):
+    """Connect to the configured database backend"""
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        print("Successfully connected to MySQL database")
+        connection = backends.connect(backend)
+        print(f"Successfully connected to {backend} database")
         return connection
-    except mysql.connector.Error as err:
-        print(f"Error connecting to MySQL: {err}")
+    except (ImportError, ValueError) + backends.database_errors() as err:
+        print(f"Error connecting to {backend}: {err}")
         sys.exit(1)
 
 def read_books_csv():
@@ -52,11 +53,11 @@ def insert_books(cursor, books_df):
     print("Inserting books from CSV...")
     
     # Get category mappings
-    cursor.execute("SELECT category_id, name FROM categories")
+    cursor.execute("SELECT category_id, name FROM categories ORDER BY category_id")
     categories = {name.lower(): cat_id for cat_id, name in cursor.fetchall()}
     
     # Get publisher mappings
-    cursor.execute("SELECT publisher_id, name FROM publishers")
+    cursor.execute("SELECT publisher_id, name FROM publishers ORDER BY publisher_id")
     publishers = {name: pub_id for pub_id, name in cursor.fetchall()}
     publisher_ids = list(publishers.values())
     
@@ -124,10 +125,10 @@ def generate_additional_books(cursor, target_total=None):
         return
     
     # Get category and publisher IDs
-    cursor.execute("SELECT category_id FROM categories")
+    cursor.execute("SELECT category_id FROM categories ORDER BY category_id")
     category_ids = [row[0] for row in cursor.fetchall()]
     
-    cursor.execute("SELECT publisher_id FROM publishers")
+    cursor.execute("SELECT publisher_id FROM publishers ORDER BY publisher_id")
     publisher_ids = [row[0] for row in cursor.fetchall()]
     
     # Generate additional books
@@ -205,10 +206,10 @@ def link_books_to_authors(cursor):
     print("🔗 Linking books to authors...")
     
     # Get all books and authors
-    cursor.execute("SELECT book_id FROM books")
+    cursor.execute("SELECT book_id FROM books ORDER BY book_id")
     book_ids = [row[0] for row in cursor.fetchall()]
     
-    cursor.execute("SELECT author_id FROM authors")
+    cursor.execute("SELECT author_id FROM authors ORDER BY author_id")
     author_ids = [row[0] for row in cursor.fetchall()]
     
     links_created = 0
@@ -295,7 +296,7 @@ def generate_orders(cursor, count=100):
     print("Generating orders...")
     
     # Get customer IDs
-    cursor.execute("SELECT customer_id FROM customers")
+    cursor.execute("SELECT customer_id FROM customers ORDER BY customer_id")
     customer_ids = [row[0] for row in cursor.fetchall()]
     
     statuses = ['Pending', 'Processing', 'Shipped', 'Delivered', 'Cancelled', 'Returned']
@@ -343,10 +344,10 @@ def generate_order_items(cursor, count=300):
     print("Generating order items...")
     
     # Get order and book IDs
-    cursor.execute("SELECT order_id FROM orders")
+    cursor.execute("SELECT order_id FROM orders ORDER BY order_id")
     order_ids = [row[0] for row in cursor.fetchall()]
     
-    cursor.execute("SELECT book_id, price FROM books")
+    cursor.execute("SELECT book_id, price FROM books ORDER BY book_id")
     books = cursor.fetchall()
     
     for i in range(count):
@@ -375,10 +376,10 @@ def generate_reviews(cursor, count=50):
     print("Generating book reviews...")
     
     # Get customer and book IDs
-    cursor.execute("SELECT customer_id FROM customers")
+    cursor.execute("SELECT customer_id FROM customers ORDER BY customer_id")
     customer_ids = [row[0] for row in cursor.fetchall()]
     
-    cursor.execute("SELECT book_id FROM books")
+    cursor.execute("SELECT book_id FROM books ORDER BY book_id")
     book_ids = [row[0] for row in cursor.fetchall()]
     
     review_titles = ['Great book!', 'Highly recommended', 'Good read', 'Interesting story', 'Worth reading']
@@ -419,7 +420,7 @@ def generate_inventory_transactions(cursor, count=200):
     print("Generating inventory transactions...")
     
     # Get book IDs
-    cursor.execute("SELECT book_id FROM books")
+    cursor.execute("SELECT book_id FROM books ORDER BY book_id")
     book_ids = [row[0] for row in cursor.fetchall()]
     
     transaction_types = ['Purchase', 'Sale', 'Adjustment', 'Damaged']
@@ -473,10 +474,10 @@ def generate_wishlist_items(cursor, count=50):
     print("Generating wishlist items...")
     
     # Get customer and book IDs
-    cursor.execute("SELECT customer_id FROM customers")
+    cursor.execute("SELECT customer_id FROM customers ORDER BY customer_id")
     customer_ids = [row[0] for row in cursor.fetchall()]
     
-    cursor.execute("SELECT book_id FROM books")
+    cursor.execute("SELECT book_id FROM books ORDER BY book_id")
     book_ids = [row[0] for row in cursor.fetchall()]
     
     priorities = ['Low', 'Medium', 'High']
@@ -569,35 +570,67 @@ def print_summary(cursor):
         except Exception as e:
             print(f"{table_name:.<30} {'ERROR':>10}")
 
+def import_all_data(cursor, books_df):
+    """Insert the CSV books and generate all supporting data
+
+    The random generator is seeded from DATA_SETTINGS['random_seed'] so the same
+    seed on a freshly created schema always produces the same rows (see verify_import.py).
+    """
+    random.seed(DATA_SETTINGS['random_seed'])
+    
+    # Insert books from CSV
+    insert_books(cursor, books_df)
+    
+    # Generate additional books
+    generate_additional_books(cursor)
+    
+    # Generate supporting data
+    generate_authors(cursor, count=DATA_SETTINGS['authors_count'])
+    link_books_to_authors(cursor)
+    generate_customers(cursor, count=DATA_SETTINGS['customers_count'])
+    generate_orders(cursor, count=DATA_SETTINGS['orders_count'])
+    generate_order_items(cursor, count=DATA_SETTINGS['order_items_count'])
+    generate_reviews(cursor, count=DATA_SETTINGS['reviews_count'])
+    generate_inventory_transactions(cursor, count=DATA_SETTINGS['inventory_transactions_count'])
+    generate_wishlist_items(cursor, count=DATA_SETTINGS['wishlist_items_count'])
+    generate_discount_codes(cursor)
+
 def main():
     """Main function to run the data import process"""
+    parser = argparse.ArgumentParser(description="Import books.csv and generate sample data")
+    parser.add_argument('--backend', choices=backends.BACKENDS, default=BACKEND,
+                        help=f"database backend (default: {BACKEND})")
+    parser.add_argument('--load-schema', action='store_true',
+                        help="drop and recreate the schema from schema_design.sql before importing")
+    parser.add_argument('--reset-remote', action='store_true',
+                        help="allow --load-schema to drop the bookstore database on the remote 'mysql' backend")
+    args = parser.parse_args()
+    
     print("Starting Online Bookstore Data Import")
     print("="*50)
     
+    # Create the schema first if requested (needed for a fresh local backend)
+    if args.load_schema:
+        try:
+            backends.reset_database(args.backend, allow_remote=args.reset_remote)
+            schema_connection = backends.connect(args.backend, with_database=False)
+            statements = backends.load_schema(schema_connection, args.backend)
+            schema_connection.close()
+            print(f"Loaded schema_design.sql ({statements} statements)")
+        except (ImportError, ValueError) + backends.database_errors() as err:
+            print(f"Error loading schema: {err}")
+            sys.exit(1)
+    
     # Connect to database
-    connection = connect_to_database()
+    connection = connect_to_database(args.backend)
     cursor = connection.cursor()
     
     try:
         # Read books CSV
         books_df = read_books_csv()
         
-        # Insert books from CSV
-        insert_books(cursor, books_df)
-        
-        # Generate additional books
-        generate_additional_books(cursor)
-        
-        # Generate supporting data
-        generate_authors(cursor, count=DATA_SETTINGS['authors_count'])
-        link_books_to_authors(cursor)
-        generate_customers(cursor, count=DATA_SETTINGS['customers_count'])
-        generate_orders(cursor, count=DATA_SETTINGS['orders_count'])
-        generate_order_items(cursor, count=DATA_SETTINGS['order_items_count'])
-        generate_reviews(cursor, count=DATA_SETTINGS['reviews_count'])
-        generate_inventory_transactions(cursor, count=DATA_SETTINGS['inventory_transactions_count'])
-        generate_wishlist_items(cursor, count=DATA_SETTINGS['wishlist_items_count'])
-        generate_discount_codes(cursor)
+        # Insert books and generate supporting data
+        import_all_data(cursor, books_df)
         
         # Commit all changes
         connection.commit()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Streaming Export Module for Online Bookstore Management System
+This module exports large view and report results with constant client memory.
+Rows are read from an unbuffered (server-side) cursor with fetchmany() and handed
+out in batches as lists of tuples, pandas DataFrames or Arrow record batches, and
+written to CSV or Parquet one batch at a time.
+"""
+
+import argparse
+import csv
+import os
+import re
+import sys
+import time
+
+import mysql.connector
+from mysql.connector.constants import FieldFlag, FieldType
+import backends
+from config import EXPORT_SETTINGS
+
+COMPLEX_QUERIES_PATH = os.path.join(os.path.dirname(__file__), '..', 'complex_queries.sql')
+
+# Named exports; the numbered reports of complex_queries.sql are added by load_report_queries()
+EXPORT_QUERIES = {
+    'book_sales_performance': "SELECT * FROM v_book_sales_performance",
+    'customer_order_summary': "SELECT * FROM v_customer_order_summary",
+    'monthly_sales_dashboard': "SELECT * FROM v_monthly_sales_dashboard",
+    'top_customers': "SELECT * FROM v_top_customers",
+    'book_inventory_status': "SELECT * FROM vw_book_inventory_status",
+}
+
+def load_report_queries(path=COMPLEX_QUERIES_PATH):
+    """Read the numbered reports of complex_queries.sql as {'complex_query_<n>': sql}"""
+    with open(path, 'r') as f:
+        content = f.read()
+
+    queries = {}
+    sections = re.split(r"^-- QUERY (\d+):.*$", content, flags=re.MULTILINE)
+    # re.split with one group gives [preamble, number, body, number, body, ...]
+    for number, body in zip(sections[1::2], sections[2::2]):
+        lines = [line for line in body.splitlines() if line.strip() and not line.lstrip().startswith('--')]
+        statement = '\n'.join(lines).strip().rstrip(';')
+        if statement:
+            queries[f"complex_query_{number}"] = statement
+    return queries
+
+def resolve_query(name):
+    """Look up a named export or complex_queries.sql report"""
+    queries = dict(EXPORT_QUERIES)
+    queries.update(load_report_queries())
+    if name not in queries:
+        raise KeyError(f"Unknown export '{name}'. Available: {', '.join(sorted(queries))}")
+    return queries[name]
+
+def require_pyarrow():
+    """Import pyarrow lazily; only the Arrow and Parquet paths need it"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("pyarrow is required for Arrow/Parquet export. "
+                          "Please install requirements with: pip install -r requirements.txt")
+    return pyarrow
+
+def iter_described_batches(connection, query, params=None, batch_size=None):
+    """Yield (cursor.description, rows) batches from an unbuffered cursor
+
+    The cursor is unbuffered, so rows stay on the server until fetchmany() asks for
+    them and at most batch_size rows are held on the client at a time. The connection
+    cannot run other statements until the generator is exhausted or closed. An empty
+    result still yields one (description, []) batch, so writers can emit a header.
+    """
+    batch_size = batch_size or EXPORT_SETTINGS['batch_size']
+    cursor = connection.cursor(buffered=False)
+    try:
+        cursor.execute(query, params)
+        description = cursor.description
+        yielded = False
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yielded = True
+            yield description, rows
+        if not yielded:
+            yield description, []
+    finally:
+        # Drain anything a caller left unread so the connection stays usable
+        if cursor.with_rows:
+            while cursor.fetchmany(batch_size):
+                pass
+        cursor.close()
+
+def iter_row_batches(connection, query, params=None, batch_size=None):
+    """Yield (column_names, rows) batches from an unbuffered cursor"""
+    for description, rows in iter_described_batches(connection, query, params, batch_size):
+        yield [column[0] for column in description], rows
+
+def iter_dataframes(connection, query, params=None, batch_size=None):
+    """Yield the result as pandas DataFrame chunks"""
+    import pandas as pd
+
+    for column_names, rows in iter_row_batches(connection, query, params, batch_size):
+        yield pd.DataFrame.from_records(rows, columns=column_names)
+
+# MySQL result column types -> Arrow types; anything not listed (text, ENUM, JSON, ...) is a string
+INTEGER_TYPES = {FieldType.TINY, FieldType.SHORT, FieldType.INT24, FieldType.LONG,
+                 FieldType.LONGLONG, FieldType.YEAR, FieldType.BIT}
+FLOAT_TYPES = {FieldType.FLOAT, FieldType.DOUBLE}
+DECIMAL_TYPES = {FieldType.DECIMAL, FieldType.NEWDECIMAL}
+DATE_TYPES = {FieldType.DATE, FieldType.NEWDATE}
+DATETIME_TYPES = {FieldType.DATETIME, FieldType.TIMESTAMP}
+BLOB_TYPES = {FieldType.TINY_BLOB, FieldType.MEDIUM_BLOB, FieldType.LONG_BLOB, FieldType.BLOB,
+              FieldType.VAR_STRING, FieldType.STRING}
+BINARY_CHARSET = 63
+# Used when neither the driver nor the first batch tells a DECIMAL column's scale
+DEFAULT_DECIMAL_SCALE = 10
+
+def decimal_scale(column, values):
+    """Scale of a DECIMAL result column
+
+    The pure-Python connector does not report it in cursor.description, but MySQL sends
+    every value of a DECIMAL column with the column's scale, so any non-NULL value gives it.
+    """
+    if len(column) > 5 and column[5] is not None:
+        return column[5]
+    for value in values:
+        if value is not None:
+            return max(-value.as_tuple().exponent, 0)
+    return DEFAULT_DECIMAL_SCALE
+
+def arrow_schema(description, first_rows):
+    """Arrow schema of a result set, from the column types in cursor.description"""
+    pa = require_pyarrow()
+    columns = list(zip(*first_rows)) if first_rows else [()] * len(description)
+    fields = []
+
+    for column, values in zip(description, columns):
+        name, type_code = column[0], column[1]
+        flags = column[7] if len(column) > 7 else 0
+        charset = column[8] if len(column) > 8 else None
+
+        if type_code in INTEGER_TYPES:
+            unsigned_bigint = type_code == FieldType.LONGLONG and flags & FieldFlag.UNSIGNED
+            field_type = pa.uint64() if unsigned_bigint else pa.int64()
+        elif type_code in FLOAT_TYPES:
+            field_type = pa.float64()
+        elif type_code in DECIMAL_TYPES:
+            field_type = pa.decimal128(38, decimal_scale(column, values))
+        elif type_code in DATE_TYPES:
+            field_type = pa.date32()
+        elif type_code in DATETIME_TYPES:
+            field_type = pa.timestamp('us')
+        elif type_code == FieldType.TIME:
+            field_type = pa.duration('us')
+        elif type_code in BLOB_TYPES and charset == BINARY_CHARSET:
+            field_type = pa.binary()
+        else:
+            field_type = pa.string()
+        fields.append(pa.field(name, field_type))
+
+    return pa.schema(fields)
+
+def iter_record_batches(connection, query, params=None, batch_size=None):
+    """Yield the result as Arrow record batches sharing one schema
+
+    The schema comes from the column types the server reports, not from the values of
+    the first batch, so a column that is NULL throughout a batch (e.g. avg_rating of a
+    LEFT JOIN) keeps its real type in later batches.
+    """
+    pa = require_pyarrow()
+    schema = None
+
+    for description, rows in iter_described_batches(connection, query, params, batch_size):
+        if schema is None:
+            schema = arrow_schema(description, rows)
+        columns = list(zip(*rows)) if rows else [()] * len(schema)
+        arrays = [pa.array(values, type=field.type) for values, field in zip(columns, schema)]
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def write_csv(connection, query, path, params=None, batch_size=None):
+    """Stream a query result to a CSV file and return the number of rows written"""
+    rows_written = 0
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        header_written = False
+        for column_names, rows in iter_row_batches(connection, query, params, batch_size):
+            if not header_written:
+                writer.writerow(column_names)
+                header_written = True
+            writer.writerows(rows)
+            rows_written += len(rows)
+    return rows_written
+
+def write_parquet(connection, query, path, params=None, batch_size=None, row_group_size=None):
+    """Stream a query result to a Parquet file and return the number of rows written
+
+    fetchmany() batches are buffered until row_group_size rows are pending, so the file
+    gets full-size row groups rather than one small group per batch. At most
+    row_group_size + batch_size rows are held in memory.
+    """
+    pa = require_pyarrow()
+    import pyarrow.parquet as pq
+
+    row_group_size = row_group_size or EXPORT_SETTINGS['row_group_size']
+    rows_written = 0
+    writer = None
+    pending = []
+    pending_rows = 0
+    try:
+        for batch in iter_record_batches(connection, query, params, batch_size):
+            if writer is None:
+                # Created on the first (possibly empty) batch, so an empty result still gets a file
+                writer = pq.ParquetWriter(path, batch.schema)
+            if not batch.num_rows:
+                continue
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            rows_written += batch.num_rows
+
+            if pending_rows >= row_group_size:
+                table = pa.Table.from_batches(pending)
+                full = (pending_rows // row_group_size) * row_group_size
+                writer.write_table(table.slice(0, full), row_group_size=row_group_size)
+                pending = table.slice(full).to_batches()
+                pending_rows -= full
+
+        if pending_rows:
+            writer.write_table(pa.Table.from_batches(pending), row_group_size=row_group_size)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows_written
+
+def write_csv_fetchall(connection, query, path, params=None):
+    """Buffered baseline: fetchall() into a list of tuples, then write CSV"""
+    cursor = connection.cursor()
+    cursor.execute(query, params)
+    column_names = list(cursor.column_names)
+    rows = cursor.fetchall()
+    cursor.close()
+
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(column_names)
+        writer.writerows(rows)
+    return len(rows)
+
+WRITERS = {
+    'csv': write_csv,
+    'parquet': write_parquet,
+}
+
+def main():
+    """Main function to run a streaming export"""
+    parser = argparse.ArgumentParser(description="Stream a view or report to CSV/Parquet with constant memory")
+    parser.add_argument('export', nargs='?',
+                        help="named export, e.g. book_sales_performance or complex_query_3")
+    parser.add_argument('--sql', help="export an arbitrary SELECT instead of a named export")
+    parser.add_argument('--format', choices=list(WRITERS), default='csv')
+    parser.add_argument('--output', help="output file (default: <export>.<format>)")
+    parser.add_argument('--batch-size', type=int, default=EXPORT_SETTINGS['batch_size'],
+                        help="rows fetched from the server per batch")
+    parser.add_argument('--backend', choices=backends.MYSQL_BACKENDS, default=backends.DEFAULT_MYSQL_BACKEND,
+                        help=f"MySQL server to use (default: {backends.DEFAULT_MYSQL_BACKEND})")
+    parser.add_argument('--list', action='store_true', help="list the named exports and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for name in sorted({**EXPORT_QUERIES, **load_report_queries()}):
+            print(name)
+        return
+
+    if not args.sql and not args.export:
+        parser.error("give a named export or --sql")
+
+    try:
+        query = args.sql or resolve_query(args.export)
+    except KeyError as e:
+        print(e.args[0])
+        sys.exit(1)
+    output = args.output or f"{args.export or 'export'}.{args.format}"
+
+    try:
+        connection = backends.connect(args.backend)
+    except mysql.connector.Error as err:
+        print(f"Error connecting to MySQL ({args.backend}): {err}")
+        sys.exit(1)
+
+    try:
+        start = time.perf_counter()
+        rows_written = WRITERS[args.format](connection, query, output, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"Exported {rows_written} rows to {output} in {elapsed:.2f}s "
+              f"({rows_written / elapsed if elapsed else 0:,.0f} rows/s)")
+    except (ImportError, mysql.connector.Error, ValueError, TypeError) as e:
+        # pyarrow's ArrowInvalid and ArrowTypeError derive from ValueError and TypeError
+        print(f"Error during export: {e}")
+        sys.exit(1)
+    finally:
+        connection.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Inventory Reconciliation Script for Online Bookstore Management System
+This script checks books.stock_quantity against the latest inventory snapshot plus
+the ledger tail recorded after it, in parallel chunks over book_id ranges.
+Run inventory_snapshots.sql and take at least one snapshot before using it.
+"""
+
+import argparse
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import mysql.connector
+import backends
+from config import RECONCILE_SETTINGS
+from backends import WorkerConnections
+
+# Expected stock = latest snapshot + SUM(quantity_change) of ledger rows after its high-water mark.
+# Books without a snapshot come back with expected_quantity NULL.
+RECONCILE_QUERY = """
+SELECT
+    b.book_id,
+    b.stock_quantity,
+    s.stock_quantity + COALESCE(SUM(t.quantity_change), 0) AS expected_quantity,
+    s.snapshot_at
+FROM books b
+LEFT JOIN inventory_snapshots s ON s.snapshot_id = (
+    SELECT MAX(s2.snapshot_id)
+    FROM inventory_snapshots s2
+    WHERE s2.book_id = b.book_id
+)
+LEFT JOIN inventory_transactions t
+    ON t.book_id = b.book_id AND t.transaction_id > s.last_transaction_id
+WHERE b.book_id BETWEEN %s AND %s
+GROUP BY b.book_id, b.stock_quantity, s.stock_quantity, s.snapshot_at
+HAVING expected_quantity IS NULL OR expected_quantity <> b.stock_quantity
+"""
+
+def get_book_id_range(backend):
+    """Get the lowest and highest book_id"""
+    try:
+        connection = backends.connect(backend)
+    except mysql.connector.Error as err:
+        print(f"Error connecting to MySQL ({backend}): {err}")
+        sys.exit(1)
+
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT MIN(book_id), MAX(book_id) FROM books")
+        min_id, max_id = cursor.fetchone()
+        cursor.close()
+        return min_id, max_id
+    finally:
+        connection.close()
+
+def build_chunks(min_id, max_id, chunk_size):
+    """Split [min_id, max_id] into inclusive book_id ranges"""
+    chunks = []
+    start = min_id
+    while start <= max_id:
+        end = min(start + chunk_size - 1, max_id)
+        chunks.append((start, end))
+        start = end + 1
+    return chunks
+
+def reconcile_chunk(connections, chunk):
+    """Reconcile one book_id range on the worker's connection and return the problem rows"""
+    start, end = chunk
+    cursor = connections.get().cursor()
+    try:
+        cursor.execute(RECONCILE_QUERY, (start, end))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+def reconcile_inventory(chunk_size, max_workers, backend):
+    """Run reconcile_chunk over all book_id ranges in parallel"""
+    min_id, max_id = get_book_id_range(backend)
+    if min_id is None:
+        print("No books found, nothing to reconcile")
+        return [], [], []
+
+    chunks = build_chunks(min_id, max_id, chunk_size)
+    print(f"Reconciling book_id {min_id}-{max_id} in {len(chunks)} chunks with {max_workers} workers...")
+
+    mismatches = []
+    missing_snapshots = []
+    failed_chunks = []
+
+    with WorkerConnections(backend) as connections, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(reconcile_chunk, connections, chunk): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                rows = future.result()
+            except mysql.connector.Error as err:
+                print(f"⚠️ Error reconciling book_id {chunk[0]}-{chunk[1]}: {err}")
+                failed_chunks.append(chunk)
+                continue
+
+            for book_id, stock_quantity, expected_quantity, snapshot_at in rows:
+                if expected_quantity is None:
+                    missing_snapshots.append(book_id)
+                else:
+                    mismatches.append((book_id, stock_quantity, int(expected_quantity), snapshot_at))
+
+    mismatches.sort()
+    missing_snapshots.sort()
+    failed_chunks.sort()
+    return mismatches, missing_snapshots, failed_chunks
+
+def print_report(mismatches, missing_snapshots, failed_chunks):
+    """Print reconciliation results"""
+    print("\n" + "="*50)
+    print("INVENTORY RECONCILIATION REPORT")
+    print("="*50)
+
+    print(f"{'Stock mismatches':.<30} {len(mismatches):>10}")
+    print(f"{'Books without snapshot':.<30} {len(missing_snapshots):>10}")
+    print(f"{'Failed chunks':.<30} {len(failed_chunks):>10}")
+
+    if mismatches:
+        print(f"\n{'book_id':>10} {'stock':>10} {'expected':>10}  snapshot_at")
+        for book_id, stock_quantity, expected_quantity, snapshot_at in mismatches:
+            print(f"{book_id:>10} {stock_quantity:>10} {expected_quantity:>10}  {snapshot_at}")
+
+    if failed_chunks:
+        print("\nFailed book_id ranges:")
+        for start, end in failed_chunks:
+            print(f"  {start}-{end}")
+
+def main():
+    """Main function to run the inventory reconciliation"""
+    parser = argparse.ArgumentParser(description="Reconcile books.stock_quantity against inventory snapshots")
+    parser.add_argument('--chunk-size', type=int, default=RECONCILE_SETTINGS['chunk_size'],
+                        help="number of book_ids per chunk")
+    parser.add_argument('--workers', type=int, default=RECONCILE_SETTINGS['max_workers'],
+                        help="number of chunks reconciled in parallel")
+    parser.add_argument('--backend', choices=backends.MYSQL_BACKENDS, default=backends.DEFAULT_MYSQL_BACKEND,
+                        help=f"MySQL server to use (default: {backends.DEFAULT_MYSQL_BACKEND})")
+    args = parser.parse_args()
+
+    print("Starting Inventory Reconciliation")
+    print("="*50)
+
+    mismatches, missing_snapshots, failed_chunks = reconcile_inventory(args.chunk_size, args.workers, args.backend)
+    print_report(mismatches, missing_snapshots, failed_chunks)
+
+    if mismatches or failed_chunks:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,9 @@ def check_requirements():
     try:
         import pandas
         import mysql.connector
+        from config import BACKEND
+        if BACKEND == 'duckdb':
+            import duckdb
         print("All required packages are installed")
         return True
     except ImportError as e:
@@ -21,7 +24,7 @@ def check_requirements():
 
 def check_files():
     """Check if required files exist"""
-    required_files = ['books.csv', 'config.py', 'data_import.py']
+    required_files = ['books.csv', 'config.py', 'data_import.py', 'backends.py']
     missing_files = []
     
     for file in required_files:
@@ -40,6 +43,12 @@ def configure_database():
     print("\n🔧 Database Configuration")
     print("="*40)
     
+    # Local backends do not use the remote DB_CONFIG
+    from config import BACKEND
+    if BACKEND != 'mysql':
+        print(f"Using local '{BACKEND}' backend (see LOCAL_MYSQL_CONFIG / DUCKDB_SETTINGS in config.py)")
+        return True
+    
     # Check if config.py exists and has default values
     with open('config.py', 'r') as f:
         content = f.read()
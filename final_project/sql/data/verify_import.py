@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Import Verification Script for Online Bookstore Management System
+This script checks that MySQL holds exactly what data_import.py generated.
+Each table is split into primary-key ranges; an order-independent checksum of every
+range is computed in parallel on the server and compared with the checksum of the
+same range replayed on the client from the generator seed. Only mismatched ranges
+are reported, so they can be reloaded on their own.
+
+The replay assumes the import ran once against a freshly created schema with the
+current DATA_SETTINGS (including random_seed).
+
+Scale: the server side scales with --workers, the client side does not. The replay
+runs the generator serially in one thread (roughly 25k rows/s) and keeps every book,
+every unique key and the author/customer/order id lists in memory. That suits the
+importer's own data sizes (up to a few million rows); a load of around 100M rows would
+take over an hour and several GB to replay.
+"""
+
+import argparse
+import contextlib
+import io
+import re
+import sys
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from decimal import Decimal, ROUND_HALF_UP
+
+import mysql.connector
+import backends
+from config import VERIFY_SETTINGS
+from backends import WorkerConnections
+from data_import import read_books_csv, import_all_data
+
+NULL_MARKER = '\\N'
+CENT = Decimal('0.01')
+
+# Table -> (range column, [(column, kind), ...]); only the columns the importer writes.
+# Server-defaulted timestamps (created_at, updated_at, ...) are not generated and are left out.
+TABLE_SPECS = {
+    'books': ('book_id', [
+        ('book_id', 'int'), ('title', 'str'), ('price', 'dec'), ('cost', 'dec'),
+        ('stock_quantity', 'int'), ('book_url', 'str'), ('category_id', 'int'),
+        ('publisher_id', 'int'), ('publication_date', 'date'), ('pages', 'int'),
+        ('language', 'str'), ('description', 'str'),
+    ]),
+    'authors': ('author_id', [
+        ('author_id', 'int'), ('first_name', 'str'), ('last_name', 'str'),
+        ('birth_date', 'date'), ('nationality', 'str'), ('biography', 'str'),
+    ]),
+    'book_authors': ('book_id', [
+        ('book_id', 'int'), ('author_id', 'int'), ('author_order', 'int'),
+        ('royalty_percentage', 'dec'),
+    ]),
+    'customers': ('customer_id', [
+        ('customer_id', 'int'), ('first_name', 'str'), ('last_name', 'str'), ('email', 'str'),
+        ('phone', 'str'), ('date_of_birth', 'date'), ('gender', 'str'), ('address_line1', 'str'),
+        ('city', 'str'), ('state', 'str'), ('postal_code', 'str'), ('country', 'str'),
+        ('total_orders', 'int'), ('total_spent', 'dec'),
+    ]),
+    'orders': ('order_id', [
+        ('order_id', 'int'), ('customer_id', 'int'), ('order_date', 'ts'), ('status', 'str'),
+        ('subtotal', 'dec'), ('tax_amount', 'dec'), ('shipping_cost', 'dec'),
+        ('discount_amount', 'dec'), ('total_amount', 'dec'), ('payment_method', 'str'),
+        ('payment_status', 'str'), ('shipping_address', 'str'),
+    ]),
+    'order_items': ('order_item_id', [
+        ('order_item_id', 'int'), ('order_id', 'int'), ('book_id', 'int'), ('quantity', 'int'),
+        ('unit_price', 'dec'), ('total_price', 'dec'),
+    ]),
+    'book_reviews': ('review_id', [
+        ('review_id', 'int'), ('customer_id', 'int'), ('book_id', 'int'), ('rating', 'int'),
+        ('title', 'str'), ('review_text', 'str'), ('is_verified_purchase', 'bool'),
+    ]),
+    'inventory_transactions': ('transaction_id', [
+        ('transaction_id', 'int'), ('book_id', 'int'), ('transaction_type', 'str'),
+        ('quantity_change', 'int'), ('reference_id', 'int'), ('reference_type', 'str'),
+        ('notes', 'str'),
+    ]),
+    'wishlist': ('wishlist_id', [
+        ('wishlist_id', 'int'), ('customer_id', 'int'), ('book_id', 'int'),
+        ('priority', 'str'), ('notes', 'str'),
+    ]),
+    'discount_codes': ('discount_id', [
+        ('discount_id', 'int'), ('code', 'str'), ('description', 'str'), ('discount_type', 'str'),
+        ('discount_value', 'dec'), ('min_order_amount', 'dec'), ('usage_limit', 'int'),
+        ('valid_from', 'ts'), ('valid_to', 'ts'),
+    ]),
+}
+
+# AUTO_INCREMENT primary keys (book_authors has a composite key instead)
+AUTO_INCREMENT_KEYS = {
+    table: columns[0][0] for table, (_, columns) in TABLE_SPECS.items() if table != 'book_authors'
+}
+
+# Unique keys the server enforces on generated data; duplicates are rejected like in MySQL
+UNIQUE_KEYS = {
+    'book_authors': ('book_id', 'author_id'),
+    'customers': ('email',),
+    'book_reviews': ('customer_id', 'book_id'),
+    'wishlist': ('customer_id', 'book_id'),
+    'discount_codes': ('code',),
+}
+
+def canonical_value(value, kind):
+    """Render a value the way CONCAT_WS renders the stored column on the server"""
+    if value is None:
+        return NULL_MARKER
+    if kind == 'int':
+        return str(int(value))
+    if kind == 'dec':
+        # The connector sends str(float); MySQL rounds that literal half away from zero
+        decimal_value = value if isinstance(value, Decimal) else Decimal(str(value))
+        return str(decimal_value.quantize(CENT, rounding=ROUND_HALF_UP))
+    if kind == 'date':
+        return value.strftime('%Y-%m-%d')
+    if kind == 'ts':
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if kind == 'bool':
+        return '1' if value else '0'
+    return str(value)
+
+def row_checksum(row, columns):
+    """CRC32 of the canonical form of one row"""
+    text = '|'.join(canonical_value(row.get(column), kind) for column, kind in columns)
+    return zlib.crc32(text.encode('utf-8'))
+
+def server_checksum_expression(columns):
+    """SQL expression matching row_checksum on the server"""
+    parts = ', '.join(f"COALESCE({column}, '\\\\N')" for column, _ in columns)
+    return f"CRC32(CONCAT_WS('|', {parts}))"
+
+class ReplayCursor:
+    """Cursor stand-in that replays data_import.py without a database
+
+    Answers the importer's SELECTs from the rows it has seen, assigns AUTO_INCREMENT ids
+    the way InnoDB does (failed inserts still use up an id), enforces the unique keys, and
+    applies the update_stock_after_order trigger. Every accepted row is folded into its
+    chunk's (count, xor, sum) checksum instead of being kept in memory; books are kept
+    until finish() because the trigger keeps changing their stock_quantity.
+
+    The importer skips rows whose insert raises, so anything the replay cannot handle
+    is recorded in self.errors as well as raised; IntegrityError is expected and is not.
+    """
+
+    def __init__(self, categories, publishers, chunk_size):
+        self.chunk_size = chunk_size
+        self.reference = {'categories': categories, 'publishers': publishers}
+        self.next_id = {table: 0 for table in AUTO_INCREMENT_KEYS}
+        self.ids = {'authors': [], 'customers': [], 'orders': []}
+        self.books = {}
+        self.unique = {table: set() for table in UNIQUE_KEYS}
+        self.checksums = {table: {} for table in TABLE_SPECS}
+        self.result = []
+        self.errors = []
+
+    def execute(self, query, params=None):
+        try:
+            self.replay(query, params)
+        except mysql.connector.IntegrityError:
+            raise
+        except Exception as e:
+            self.errors.append(f"{type(e).__name__}: {e} ({' '.join(query.split())[:100]})")
+            raise
+
+    def replay(self, query, params):
+        sql = ' '.join(query.split())
+
+        match = re.match(r"INSERT INTO (\w+) \(([^)]*)\) VALUES", sql)
+        if match:
+            columns = [column.strip() for column in match.group(2).split(',')]
+            self.insert(match.group(1), dict(zip(columns, params)))
+            self.result = []
+            return
+
+        match = re.match(r"SELECT COUNT\(\*\) FROM (\w+)$", sql)
+        if match:
+            self.result = [(len(self.rows_for(match.group(1))),)]
+            return
+
+        match = re.match(r"SELECT (.+?) FROM (\w+)(?: ORDER BY \w+)?$", sql)
+        if match:
+            columns = [column.strip() for column in match.group(1).split(',')]
+            self.result = [tuple(row[column] for column in columns) for row in self.rows_for(match.group(2))]
+            return
+
+        raise NotImplementedError("statement not supported by the replay")
+
+    def fetchall(self):
+        rows, self.result = self.result, []
+        return rows
+
+    def fetchone(self):
+        return self.result.pop(0) if self.result else None
+
+    def rows_for(self, table):
+        """Rows of a table in primary-key order, as dicts"""
+        if table in self.reference:
+            id_column = 'category_id' if table == 'categories' else 'publisher_id'
+            return [{id_column: row_id, 'name': name} for row_id, name in self.reference[table]]
+        if table == 'books':
+            return [self.books[book_id] for book_id in sorted(self.books)]
+        key = AUTO_INCREMENT_KEYS[table]
+        return [{key: row_id} for row_id in self.ids[table]]
+
+    def insert(self, table, row):
+        key = AUTO_INCREMENT_KEYS.get(table)
+        if key:
+            self.next_id[table] += 1
+            row[key] = self.next_id[table]
+
+        if table in UNIQUE_KEYS:
+            unique_value = tuple(row[column] for column in UNIQUE_KEYS[table])
+            if unique_value in self.unique[table]:
+                raise mysql.connector.IntegrityError(msg=f"Duplicate entry {unique_value} for {table}")
+            self.unique[table].add(unique_value)
+
+        if table == 'order_items':
+            # update_stock_after_order: stock_quantity has CHECK (stock_quantity >= 0)
+            book = self.books[row['book_id']]
+            if book['stock_quantity'] < row['quantity']:
+                raise mysql.connector.IntegrityError(msg="Check constraint violated on books.stock_quantity")
+            book['stock_quantity'] -= row['quantity']
+
+        if table == 'books':
+            row['price'] = Decimal(str(row['price'])).quantize(CENT, rounding=ROUND_HALF_UP)
+            self.books[row['book_id']] = row
+        else:
+            self.add_checksum(table, row)
+            if table in self.ids:
+                self.ids[table].append(row[key])
+
+        if table == 'order_items':
+            self.insert('inventory_transactions', {
+                'book_id': row['book_id'],
+                'transaction_type': 'Sale',
+                'quantity_change': -row['quantity'],
+                'reference_id': row['order_id'],
+                'reference_type': 'Order',
+                'notes': 'Stock reduced due to sale',
+            })
+
+    def add_checksum(self, table, row):
+        range_column, columns = TABLE_SPECS[table]
+        chunk = (row[range_column] - 1) // self.chunk_size
+        count, xor, total = self.checksums[table].get(chunk, (0, 0, 0))
+        checksum = row_checksum(row, columns)
+        self.checksums[table][chunk] = (count + 1, xor ^ checksum, total + checksum)
+
+    def finish(self):
+        """Fold the books into their checksums and return {table: {chunk: (count, xor, sum)}}"""
+        for book_id in sorted(self.books):
+            self.add_checksum('books', self.books[book_id])
+        return self.checksums
+
+def fetch_reference_data(backend):
+    """Read the seed categories and publishers created by schema_design.sql"""
+    try:
+        connection = backends.connect(backend)
+    except mysql.connector.Error as err:
+        print(f"Error connecting to MySQL ({backend}): {err}")
+        sys.exit(1)
+
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT category_id, name FROM categories ORDER BY category_id")
+        categories = cursor.fetchall()
+        cursor.execute("SELECT publisher_id, name FROM publishers ORDER BY publisher_id")
+        publishers = cursor.fetchall()
+        cursor.close()
+        return categories, publishers
+    finally:
+        connection.close()
+
+def compute_expected_checksums(chunk_size, backend):
+    """Replay the import on the client and return the expected chunk checksums"""
+    print("Replaying data generation from seed...")
+    categories, publishers = fetch_reference_data(backend)
+    cursor = ReplayCursor(categories, publishers, chunk_size)
+
+    start = time.perf_counter()
+    # The importer prints progress for every step; keep the verification output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        books_df = read_books_csv()
+        import_all_data(cursor, books_df)
+
+    if cursor.errors:
+        # The importer swallowed these; without them every chunk would just mismatch
+        print(f"❌ Replay failed on {len(cursor.errors)} statements, data_import.py and the replay are out of sync:")
+        for error in cursor.errors[:10]:
+            print(f"  {error}")
+        sys.exit(1)
+
+    expected = cursor.finish()
+    rows = sum(count for chunks in expected.values() for count, _, _ in chunks.values())
+    elapsed = time.perf_counter() - start
+    print(f"Replayed {rows} rows in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s)")
+    return expected
+
+def get_server_key_range(connections, table):
+    """Highest value of the range column of a table on the server"""
+    range_column, _ = TABLE_SPECS[table]
+    cursor = connections.get().cursor()
+    cursor.execute(f"SELECT COALESCE(MAX({range_column}), 0) FROM {table}")
+    max_key = cursor.fetchone()[0]
+    cursor.close()
+    return max_key
+
+def server_chunk_checksum(connections, table, chunk, chunk_size):
+    """(count, xor, sum) of one primary-key range, computed on the server"""
+    range_column, columns = TABLE_SPECS[table]
+    expression = server_checksum_expression(columns)
+    query = f"""
+    SELECT COUNT(*), COALESCE(BIT_XOR({expression}), 0), COALESCE(SUM({expression}), 0)
+    FROM {table}
+    WHERE {range_column} BETWEEN %s AND %s
+    """
+    start = chunk * chunk_size + 1
+    cursor = connections.get().cursor()
+    cursor.execute(query, (start, start + chunk_size - 1))
+    count, xor, total = cursor.fetchone()
+    cursor.close()
+    return int(count), int(xor), int(total)
+
+def verify_tables(tables, expected, chunk_size, max_workers, backend):
+    """Compare server and expected checksums for every chunk of every table"""
+    results = {table: {'chunks': 0, 'mismatches': [], 'errors': []} for table in tables}
+
+    with WorkerConnections(backend) as connections, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        max_keys = dict(zip(tables, executor.map(lambda table: get_server_key_range(connections, table), tables)))
+
+        futures = {}
+        for table in tables:
+            expected_chunks = expected[table]
+            last_chunk = max(
+                (max_keys[table] - 1) // chunk_size if max_keys[table] else -1,
+                max(expected_chunks) if expected_chunks else -1,
+            )
+            for chunk in range(last_chunk + 1):
+                future = executor.submit(server_chunk_checksum, connections, table, chunk, chunk_size)
+                futures[future] = (table, chunk)
+
+        for future in as_completed(futures):
+            table, chunk = futures[future]
+            start = chunk * chunk_size + 1
+            key_range = (start, start + chunk_size - 1)
+            results[table]['chunks'] += 1
+            try:
+                actual = future.result()
+            except mysql.connector.Error as err:
+                results[table]['errors'].append((key_range, str(err)))
+                continue
+
+            wanted = expected[table].get(chunk, (0, 0, 0))
+            if actual != wanted:
+                results[table]['mismatches'].append((key_range, wanted[0], actual[0]))
+
+    return results
+
+def print_report(results, chunk_size):
+    """Print per-table results and the ranges that need reloading"""
+    print("\n" + "="*50)
+    print(f"IMPORT VERIFICATION SUMMARY (chunk size {chunk_size})")
+    print("="*50)
+
+    for table, result in results.items():
+        bad = len(result['mismatches']) + len(result['errors'])
+        status = 'OK' if bad == 0 else f"{bad} BAD"
+        print(f"{table:.<30} {result['chunks']:>6} chunks {status:>10}")
+
+    for table, result in results.items():
+        range_column, _ = TABLE_SPECS[table]
+        for (start, end), expected_rows, actual_rows in sorted(result['mismatches']):
+            print(f"⚠️ {table} {range_column} {start}-{end}: expected {expected_rows} rows, found {actual_rows} (checksum mismatch)")
+        for (start, end), error in sorted(result['errors']):
+            print(f"⚠️ {table} {range_column} {start}-{end}: {error}")
+
+def main():
+    """Main function to run the import verification"""
+    parser = argparse.ArgumentParser(description="Verify imported data against the seeded generator")
+    parser.add_argument('--chunk-size', type=int, default=VERIFY_SETTINGS['chunk_size'],
+                        help="primary-key range covered by one checksum")
+    parser.add_argument('--workers', type=int, default=VERIFY_SETTINGS['max_workers'],
+                        help="number of chunks checksummed in parallel")
+    parser.add_argument('--backend', choices=backends.MYSQL_BACKENDS, default=backends.DEFAULT_MYSQL_BACKEND,
+                        help=f"MySQL server to use (default: {backends.DEFAULT_MYSQL_BACKEND})")
+    parser.add_argument('--tables', nargs='+', choices=list(TABLE_SPECS), default=list(TABLE_SPECS),
+                        help="tables to verify (default: all imported tables)")
+    args = parser.parse_args()
+
+    print("Starting Import Verification")
+    print("="*50)
+
+    expected = compute_expected_checksums(args.chunk_size, args.backend)
+    print(f"Checksumming {len(args.tables)} tables on the server with {args.workers} workers...")
+    results = verify_tables(args.tables, expected, args.chunk_size, args.workers, args.backend)
+    print_report(results, args.chunk_size)
+
+    if any(result['mismatches'] or result['errors'] for result in results.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
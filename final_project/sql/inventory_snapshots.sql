@@ -0,0 +1,425 @@
+-- =====================================================
+-- INVENTORY LEDGER SNAPSHOTS AND COMPACTION
+-- =====================================================
+-- Periodic per-book stock snapshots, ledger compaction into
+-- snapshot deltas, and point-in-time stock lookups
+-- =====================================================
+
+USE bookstore;
+
+-- =====================================================
+-- SNAPSHOT AND ARCHIVE TABLES
+-- =====================================================
+
+-- 1. INVENTORY_SNAPSHOTS TABLE
+-- Purpose: Store the stock level of every book at a point in time
+-- Keys: snapshot_id (PK), book_id (FK)
+-- last_transaction_id is the ledger high-water mark covered by the snapshot:
+-- stock at any later time = stock_quantity + SUM(quantity_change) of ledger rows
+-- with a higher transaction_id
+CREATE TABLE IF NOT EXISTS inventory_snapshots (
+    snapshot_id INT AUTO_INCREMENT PRIMARY KEY,
+    book_id INT NOT NULL,
+    snapshot_at TIMESTAMP NOT NULL,
+    stock_quantity INT NOT NULL,
+    last_transaction_id INT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (book_id) REFERENCES books(book_id) ON DELETE CASCADE,
+    INDEX idx_book_snapshot (book_id, snapshot_id),
+    INDEX idx_snapshot_at (snapshot_at)
+);
+
+-- 2. INVENTORY_LEDGER_COMPACTIONS TABLE
+-- Purpose: Per-book deltas of the ledger rows rolled up by a compaction run
+-- Keys: compaction_id (PK), book_id (FK), snapshot_id (FK)
+CREATE TABLE IF NOT EXISTS inventory_ledger_compactions (
+    compaction_id INT AUTO_INCREMENT PRIMARY KEY,
+    book_id INT NOT NULL,
+    snapshot_id INT NOT NULL,
+    first_transaction_id INT NOT NULL,
+    last_transaction_id INT NOT NULL,
+    transactions_compacted INT NOT NULL,
+    quantity_delta INT NOT NULL,
+    period_start TIMESTAMP NULL,
+    period_end TIMESTAMP NULL,
+    compacted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (book_id) REFERENCES books(book_id) ON DELETE CASCADE,
+    FOREIGN KEY (snapshot_id) REFERENCES inventory_snapshots(snapshot_id) ON DELETE CASCADE,
+    INDEX idx_book_compaction (book_id, last_transaction_id),
+    INDEX idx_compacted_at (compacted_at)
+);
+
+-- 3. INVENTORY_TRANSACTIONS_ARCHIVE TABLE
+-- Purpose: Cold storage for ledger rows removed by compaction
+-- Keys: transaction_id (PK, same value as in inventory_transactions)
+CREATE TABLE IF NOT EXISTS inventory_transactions_archive (
+    transaction_id INT PRIMARY KEY,
+    book_id INT NOT NULL,
+    transaction_type ENUM('Purchase', 'Sale', 'Return', 'Adjustment', 'Damaged', 'Lost') NOT NULL,
+    quantity_change INT NOT NULL,
+    reference_id INT NULL,
+    reference_type ENUM('Order', 'Purchase Order', 'Manual', 'System') DEFAULT 'Manual',
+    notes TEXT,
+    created_at TIMESTAMP NULL,
+    created_by VARCHAR(100),
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_archive_book_transaction (book_id, transaction_id),
+    INDEX idx_archive_date (created_at)
+);
+
+-- Ledger index for "tail since snapshot" lookups (book_id + transaction_id range).
+-- MySQL has no CREATE INDEX IF NOT EXISTS, so check information_schema first and
+-- keep the script safe to re-run
+SET @index_exists = (
+    SELECT COUNT(*)
+    FROM information_schema.STATISTICS
+    WHERE table_schema = DATABASE()
+        AND table_name = 'inventory_transactions'
+        AND index_name = 'idx_inventory_book_transaction_id'
+);
+SET @create_index_sql = IF(
+    @index_exists = 0,
+    'CREATE INDEX idx_inventory_book_transaction_id ON inventory_transactions(book_id, transaction_id)',
+    'SELECT ''idx_inventory_book_transaction_id already exists'' AS message'
+);
+PREPARE create_index_stmt FROM @create_index_sql;
+EXECUTE create_index_stmt;
+DEALLOCATE PREPARE create_index_stmt;
+
+-- =====================================================
+-- SNAPSHOT AND COMPACTION PROCEDURES
+-- =====================================================
+
+-- PROCEDURE 1: TAKE INVENTORY SNAPSHOT
+-- Purpose: Record the current stock of every book that has ledger activity since its
+-- last snapshot (or has no snapshot yet), together with its ledger high-water mark.
+-- Books are processed in ranges of p_batch_size, so only one range of books is locked
+-- against stock changes at a time and order placement elsewhere carries on.
+-- Each range is stamped with the time its lock was taken, not the start of the run.
+DROP PROCEDURE IF EXISTS sp_take_inventory_snapshot;
+DELIMITER //
+CREATE PROCEDURE sp_take_inventory_snapshot(
+    IN p_batch_size INT,
+    OUT p_status VARCHAR(100),
+    OUT p_message TEXT
+)
+BEGIN
+    DECLARE v_started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+    DECLARE v_snapshot_at TIMESTAMP;
+    DECLARE v_from_book_id INT DEFAULT 0;
+    DECLARE v_to_book_id INT DEFAULT 0;
+    DECLARE v_max_book_id INT DEFAULT 0;
+    DECLARE v_batch_books INT DEFAULT 0;
+    DECLARE v_batch_rows INT DEFAULT 0;
+    DECLARE v_books_snapshotted INT DEFAULT 0;
+    DECLARE v_error_text TEXT;
+
+    -- Stop at the first error: carrying on would write a batch without its lock
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        GET DIAGNOSTICS CONDITION 1 v_error_text = MESSAGE_TEXT;
+        ROLLBACK;
+        SET p_status = 'ERROR';
+        SET p_message = CONCAT('Inventory snapshot stopped after ', v_books_snapshotted, ' books: ', v_error_text);
+    END;
+
+    IF p_batch_size IS NULL OR p_batch_size <= 0 THEN
+        SET p_batch_size = 1000;
+    END IF;
+
+    SELECT COALESCE(MIN(book_id), 1), COALESCE(MAX(book_id), 0)
+    INTO v_from_book_id, v_max_book_id
+    FROM books;
+
+    WHILE v_from_book_id <= v_max_book_id DO
+        SET v_to_book_id = v_from_book_id + p_batch_size - 1;
+
+        START TRANSACTION;
+
+        -- Wait for in-flight stock changes of this range and hold them off until its
+        -- snapshot rows are written, so stock_quantity and the high-water mark agree
+        SELECT COUNT(*) INTO v_batch_books
+        FROM books
+        WHERE book_id BETWEEN v_from_book_id AND v_to_book_id
+        FOR SHARE;
+
+        -- SYSDATE() rather than NOW(): the time the lock was granted, so ledger rows
+        -- covered by this batch are never dated after its snapshot_at
+        SET v_snapshot_at = SYSDATE();
+
+        -- The high-water mark is per book: later ledger rows of a locked book can only
+        -- get higher transaction_ids. Books without new ledger rows keep their previous
+        -- snapshot, which fn_stock_as_of and the reconciliation already fall back to.
+        INSERT INTO inventory_snapshots (book_id, snapshot_at, stock_quantity, last_transaction_id)
+        SELECT b.book_id, v_snapshot_at, b.stock_quantity, COALESCE(ledger.last_transaction_id, 0)
+        FROM books b
+        LEFT JOIN (
+            SELECT book_id, MAX(transaction_id) AS last_transaction_id
+            FROM inventory_transactions
+            WHERE book_id BETWEEN v_from_book_id AND v_to_book_id
+            GROUP BY book_id
+        ) ledger ON ledger.book_id = b.book_id
+        LEFT JOIN (
+            SELECT book_id, MAX(last_transaction_id) AS last_transaction_id
+            FROM inventory_snapshots
+            WHERE book_id BETWEEN v_from_book_id AND v_to_book_id
+            GROUP BY book_id
+        ) previous ON previous.book_id = b.book_id
+        WHERE b.book_id BETWEEN v_from_book_id AND v_to_book_id
+            AND (previous.book_id IS NULL OR ledger.last_transaction_id > previous.last_transaction_id);
+        SET v_batch_rows = ROW_COUNT();
+
+        COMMIT;
+        SET v_books_snapshotted = v_books_snapshotted + v_batch_rows;
+
+        SET v_from_book_id = v_to_book_id + 1;
+    END WHILE;
+
+    SET p_status = 'SUCCESS';
+    SET p_message = CONCAT('Snapshot of ', v_books_snapshotted, ' changed books taken since ', v_started_at);
+END//
+DELIMITER ;
+
+-- PROCEDURE 2: COMPACT INVENTORY LEDGER
+-- Purpose: Roll ledger rows covered by a snapshot taken at or before p_cutoff into
+-- per-book deltas, move them to the archive and delete them from the live ledger.
+-- Snapshots older than that bounding snapshot are pruned unless a compaction row still
+-- references them; fn_stock_as_of works backwards from the bounding snapshot through
+-- the archive for times before it.
+-- Books are processed in ranges of p_batch_size so each transaction stays small.
+DROP PROCEDURE IF EXISTS sp_compact_inventory_ledger;
+DELIMITER //
+CREATE PROCEDURE sp_compact_inventory_ledger(
+    IN p_cutoff TIMESTAMP,
+    IN p_batch_size INT,
+    OUT p_status VARCHAR(100),
+    OUT p_message TEXT
+)
+BEGIN
+    DECLARE v_from_book_id INT DEFAULT 0;
+    DECLARE v_to_book_id INT DEFAULT 0;
+    DECLARE v_max_book_id INT DEFAULT 0;
+    DECLARE v_rows_compacted INT DEFAULT 0;
+    DECLARE v_snapshots_pruned INT DEFAULT 0;
+    DECLARE v_batch_rows INT DEFAULT 0;
+    DECLARE v_batch_snapshots INT DEFAULT 0;
+    DECLARE v_error_text TEXT;
+
+    -- Stop at the first error: after a rollback the batch's DELETE would otherwise
+    -- remove ledger rows that were never archived
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        GET DIAGNOSTICS CONDITION 1 v_error_text = MESSAGE_TEXT;
+        ROLLBACK;
+        DROP TEMPORARY TABLE IF EXISTS tmp_compaction_bounds;
+        SET p_status = 'ERROR';
+        SET p_message = CONCAT('Compaction stopped after ', v_rows_compacted, ' rows: ', v_error_text);
+    END;
+
+    IF p_batch_size IS NULL OR p_batch_size <= 0 THEN
+        SET p_batch_size = 1000;
+    END IF;
+
+    -- Latest snapshot at or before the cutoff bounds what can be compacted for each book
+    DROP TEMPORARY TABLE IF EXISTS tmp_compaction_bounds;
+    CREATE TEMPORARY TABLE tmp_compaction_bounds (
+        book_id INT PRIMARY KEY,
+        snapshot_id INT NOT NULL,
+        last_transaction_id INT NOT NULL
+    );
+
+    INSERT INTO tmp_compaction_bounds (book_id, snapshot_id, last_transaction_id)
+    SELECT s.book_id, s.snapshot_id, s.last_transaction_id
+    FROM inventory_snapshots s
+    WHERE s.snapshot_id = (
+        SELECT MAX(s2.snapshot_id)
+        FROM inventory_snapshots s2
+        WHERE s2.book_id = s.book_id
+            AND s2.snapshot_at <= p_cutoff
+    );
+
+    SELECT COALESCE(MIN(book_id), 1), COALESCE(MAX(book_id), 0)
+    INTO v_from_book_id, v_max_book_id
+    FROM tmp_compaction_bounds;
+
+    WHILE v_from_book_id <= v_max_book_id DO
+        SET v_to_book_id = v_from_book_id + p_batch_size - 1;
+
+        START TRANSACTION;
+
+        INSERT INTO inventory_ledger_compactions (
+            book_id, snapshot_id, first_transaction_id, last_transaction_id,
+            transactions_compacted, quantity_delta, period_start, period_end
+        )
+        SELECT
+            t.book_id, cb.snapshot_id, MIN(t.transaction_id), MAX(t.transaction_id),
+            COUNT(*), SUM(t.quantity_change), MIN(t.created_at), MAX(t.created_at)
+        FROM inventory_transactions t
+        INNER JOIN tmp_compaction_bounds cb
+            ON t.book_id = cb.book_id AND t.transaction_id <= cb.last_transaction_id
+        WHERE cb.book_id BETWEEN v_from_book_id AND v_to_book_id
+        GROUP BY t.book_id, cb.snapshot_id;
+
+        INSERT INTO inventory_transactions_archive (
+            transaction_id, book_id, transaction_type, quantity_change, reference_id,
+            reference_type, notes, created_at, created_by
+        )
+        SELECT
+            t.transaction_id, t.book_id, t.transaction_type, t.quantity_change, t.reference_id,
+            t.reference_type, t.notes, t.created_at, t.created_by
+        FROM inventory_transactions t
+        INNER JOIN tmp_compaction_bounds cb
+            ON t.book_id = cb.book_id AND t.transaction_id <= cb.last_transaction_id
+        WHERE cb.book_id BETWEEN v_from_book_id AND v_to_book_id;
+
+        DELETE t
+        FROM inventory_transactions t
+        INNER JOIN tmp_compaction_bounds cb
+            ON t.book_id = cb.book_id AND t.transaction_id <= cb.last_transaction_id
+        WHERE cb.book_id BETWEEN v_from_book_id AND v_to_book_id;
+        SET v_batch_rows = ROW_COUNT();
+
+        -- Superseded snapshots: the bounding snapshot and the ledger tail after it
+        -- replace them, except where an earlier compaction row points at one
+        DELETE s
+        FROM inventory_snapshots s
+        INNER JOIN tmp_compaction_bounds cb
+            ON s.book_id = cb.book_id AND s.snapshot_id < cb.snapshot_id
+        LEFT JOIN inventory_ledger_compactions c ON c.snapshot_id = s.snapshot_id
+        WHERE cb.book_id BETWEEN v_from_book_id AND v_to_book_id
+            AND c.compaction_id IS NULL;
+        SET v_batch_snapshots = ROW_COUNT();
+
+        COMMIT;
+        SET v_rows_compacted = v_rows_compacted + v_batch_rows;
+        SET v_snapshots_pruned = v_snapshots_pruned + v_batch_snapshots;
+
+        SET v_from_book_id = v_to_book_id + 1;
+    END WHILE;
+
+    DROP TEMPORARY TABLE IF EXISTS tmp_compaction_bounds;
+
+    SET p_status = 'SUCCESS';
+    SET p_message = CONCAT('Compacted ', v_rows_compacted, ' ledger rows and pruned ',
+                           v_snapshots_pruned, ' snapshots older than ', p_cutoff);
+END//
+DELIMITER ;
+
+-- =====================================================
+-- POINT-IN-TIME STOCK LOOKUP
+-- =====================================================
+
+-- FUNCTION: STOCK AS OF A POINT IN TIME
+-- Purpose: Latest snapshot at or before p_as_of plus the short ledger tail after it.
+-- Before the oldest remaining snapshot (compaction prunes older ones), work backwards
+-- instead: the earliest snapshot after p_as_of minus the ledger rows it covers that
+-- were created after p_as_of. Both directions read the live ledger and the archive,
+-- so lookups keep working for compacted periods. Returns NULL when the book has no
+-- snapshot at all.
+DROP FUNCTION IF EXISTS fn_stock_as_of;
+DELIMITER //
+CREATE FUNCTION fn_stock_as_of(
+    p_book_id INT,
+    p_as_of TIMESTAMP
+)
+RETURNS INT
+READS SQL DATA
+BEGIN
+    DECLARE v_stock_quantity INT DEFAULT NULL;
+    DECLARE v_last_transaction_id INT DEFAULT 0;
+    DECLARE v_change INT DEFAULT 0;
+
+    SELECT stock_quantity, last_transaction_id
+    INTO v_stock_quantity, v_last_transaction_id
+    FROM inventory_snapshots
+    WHERE book_id = p_book_id
+        AND snapshot_at <= p_as_of
+    ORDER BY snapshot_id DESC
+    LIMIT 1;
+
+    IF v_stock_quantity IS NOT NULL THEN
+        -- Forward: ledger rows after the snapshot, up to p_as_of
+        SELECT COALESCE(SUM(tail.quantity_change), 0) INTO v_change
+        FROM (
+            SELECT quantity_change
+            FROM inventory_transactions
+            WHERE book_id = p_book_id
+                AND transaction_id > v_last_transaction_id
+                AND created_at <= p_as_of
+            UNION ALL
+            SELECT quantity_change
+            FROM inventory_transactions_archive
+            WHERE book_id = p_book_id
+                AND transaction_id > v_last_transaction_id
+                AND created_at <= p_as_of
+        ) tail;
+
+        RETURN v_stock_quantity + v_change;
+    END IF;
+
+    SELECT stock_quantity, last_transaction_id
+    INTO v_stock_quantity, v_last_transaction_id
+    FROM inventory_snapshots
+    WHERE book_id = p_book_id
+        AND snapshot_at > p_as_of
+    ORDER BY snapshot_id ASC
+    LIMIT 1;
+
+    IF v_stock_quantity IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- Backward: undo the ledger rows the snapshot covers that came after p_as_of
+    SELECT COALESCE(SUM(head.quantity_change), 0) INTO v_change
+    FROM (
+        SELECT quantity_change
+        FROM inventory_transactions
+        WHERE book_id = p_book_id
+            AND transaction_id <= v_last_transaction_id
+            AND created_at > p_as_of
+        UNION ALL
+        SELECT quantity_change
+        FROM inventory_transactions_archive
+        WHERE book_id = p_book_id
+            AND transaction_id <= v_last_transaction_id
+            AND created_at > p_as_of
+    ) head;
+
+    RETURN v_stock_quantity - v_change;
+END//
+DELIMITER ;
+
+-- =====================================================
+-- EVENT SCHEDULER FOR SNAPSHOTS AND COMPACTION
+-- =====================================================
+
+-- Take a snapshot every night at 1 AM (events are recreated so re-runs pick up signature changes)
+DROP EVENT IF EXISTS ev_take_inventory_snapshot;
+CREATE EVENT ev_take_inventory_snapshot
+ON SCHEDULE EVERY 1 DAY
+STARTS TIMESTAMP(CURDATE() + INTERVAL 1 DAY, '01:00:00')
+DO
+  CALL sp_take_inventory_snapshot(1000, @snapshot_status, @snapshot_message);
+
+-- Compact ledger rows older than 90 days once a week
+DROP EVENT IF EXISTS ev_compact_inventory_ledger;
+CREATE EVENT ev_compact_inventory_ledger
+ON SCHEDULE EVERY 1 WEEK
+STARTS TIMESTAMP(CURDATE() + INTERVAL 1 DAY, '03:00:00')
+DO
+  CALL sp_compact_inventory_ledger(NOW() - INTERVAL 90 DAY, 1000, @compaction_status, @compaction_message);
+
+-- =====================================================
+-- USAGE EXAMPLES
+-- =====================================================
+
+-- CALL sp_take_inventory_snapshot(1000, @status, @message);
+-- SELECT @status, @message;
+
+-- CALL sp_compact_inventory_ledger(NOW() - INTERVAL 90 DAY, 1000, @status, @message);
+-- SELECT @status, @message;
+
+-- SELECT fn_stock_as_of(1, '2024-06-30 23:59:59') AS stock_on_june_30;
+
+-- Parallel reconciliation of books.stock_quantity against snapshot + ledger tail:
+-- python data/inventory_reconcile.py --workers 8 --chunk-size 10000